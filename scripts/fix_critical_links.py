@@ -6,6 +6,7 @@ Purpose: Fix critical broken links in installation and setup documentation
 """
 
 import json
+import mmap
 import os
 import re
 import sys
@@ -33,7 +34,8 @@ critical_link_fixes: Dict[str, str] = {}
 
 try:
     with open(os.path.join(os.path.dirname(__file__), "link_mappings.json"), "r") as f:
-        critical_link_fixes = json.load(f)
+        critical_link_fixes = {sys.intern(k.strip()): v
+                               for k, v in json.load(f).items()}
     print(
         f"Loaded {len(critical_link_fixes)} link mappings from link_mappings.json")
 except Exception as e:
@@ -48,6 +50,24 @@ except Exception as e:
 
 # Regular expression pattern for markdown links
 LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+LINK_PATTERN_BYTES = re.compile(LINK_PATTERN.pattern.encode())
+
+# Link prefixes that never point at a local document
+EXTERNAL_PREFIXES = ('http://', 'https://', 'mailto:', '#')
+
+
+def has_fixable_links(file_path: str) -> bool:
+    """Scan the raw file bytes for any link with a known fix"""
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in LINK_PATTERN_BYTES.finditer(mm):
+                link_path = match.group(2).decode('utf-8', errors='replace')
+                if link_path in critical_link_fixes:
+                    return True
+    return False
 
 
 def fix_file(file_path: str) -> int:
@@ -56,32 +76,39 @@ def fix_file(file_path: str) -> int:
         print(f"File not found: {file_path}")
         return 0
 
+    # Most files need no changes; skip decoding them entirely
+    if not has_fixable_links(file_path):
+        print(f"✓ No critical links to fix in {os.path.basename(file_path)}")
+        return 0
+
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    original_content = content
     fixed_count = 0
 
-    # Find all markdown links
-    links = LINK_PATTERN.findall(content)
-    for link_text, link_path in links:
+    def replace_link(match: re.Match) -> str:
+        nonlocal fixed_count
+        link_text, link_path = match.group(1), match.group(2)
         # Skip external links
-        if link_path.startswith(('http://', 'https://')):
-            continue
+        if link_path.startswith(EXTERNAL_PREFIXES):
+            return match.group(0)
 
         # Check if this is a known broken link we need to fix
-        if link_path in critical_link_fixes:
-            new_link = critical_link_fixes[link_path]
-            old_link = f"[{link_text}]({link_path})"
+        new_link = critical_link_fixes.get(link_path)
+        if new_link is not None:
             new_link_text = f"[{link_text}]({new_link})"
-            content = content.replace(old_link, new_link_text)
             fixed_count += 1
-            print(f"  Fixed: {old_link} -> {new_link_text}")
+            print(f"  Fixed: {match.group(0)} -> {new_link_text}")
+            return new_link_text
+        return match.group(0)
+
+    # Rewrite all markdown links in a single pass over the content
+    new_content = LINK_PATTERN.sub(replace_link, content)
 
     # Write back if changes were made
-    if content != original_content:
+    if new_content != content:
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write(new_content)
         print(f"✓ Fixed {fixed_count} links in {os.path.basename(file_path)}")
     else:
         print(f"✓ No critical links to fix in {os.path.basename(file_path)}")
@@ -7,18 +7,18 @@ def slug_to_title(name):
 # Generate index.md for each first-level docs directory
 root = 'docs'
 exclude_dirs = {'_layouts','ai','assets','pages','templates','system'}
-for entry in os.listdir(root):
-    dirpath = os.path.join(root, entry)
-    if not os.path.isdir(dirpath):
-        continue
-    if entry in exclude_dirs:
-        continue
-    md_files = [f for f in os.listdir(dirpath) if f.endswith('.md')]
+with os.scandir(root) as top:
+    subdirs = [e for e in top if e.is_dir() and e.name not in exclude_dirs]
+for entry in subdirs:
+    dirpath = entry.path
+    with os.scandir(dirpath) as it:
+        md_files = sorted(e.name for e in it
+                          if e.name.endswith('.md') and e.is_file(follow_symlinks=False))
     if not md_files:
         continue
     # Create or overwrite index.md
     index_path = os.path.join(dirpath, 'index.md')
-    title = slug_to_title(entry)
+    title = slug_to_title(entry.name)
     lines = []
     # Front matter
     lines.append('---')
@@ -30,14 +30,14 @@ for entry in os.listdir(root):
     lines.append(f'# {title}')
     lines.append('')
     # List pages
-    for f in sorted(md_files):
+    for f in md_files:
         if f == 'index.md':
             continue
         link = f
         display = slug_to_title(f)
         lines.append(f'- [{display}]({link})')
-    # Write file
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines) + '\n')
+    # Write file as bytes in a single call
+    with open(index_path, 'wb') as f:
+        f.write(('\n'.join(lines) + '\n').encode('utf-8'))
 
 print('Generated index.md for docs subdirectories.')
@@ -0,0 +1,5 @@
+"""Helpers shared by the Python scripts, imported as lib.<module> from scripts/.
+
+A regular package, so it takes precedence over the namespace directory of
+the same name at the project root.
+"""
@@ -0,0 +1,33 @@
+"""CPU feature flag detection shared by the hardware scripts."""
+import platform
+import re
+from typing import FrozenSet, Optional
+
+CPUINFO_PATH = '/proc/cpuinfo'
+
+# x86 lists feature flags under "flags", ARM under "Features"
+_FLAGS_LINE_RE = re.compile(r'^(?:flags|Features)[ \t]*:[ \t]*(.*)$', re.MULTILINE)
+
+
+def parse_cpu_flags(cpuinfo: str) -> Optional[FrozenSet[str]]:
+    """Return the feature flags of the first processor in /proc/cpuinfo text.
+
+    Returns None when the text has no flags line at all.
+    """
+    match = _FLAGS_LINE_RE.search(cpuinfo)
+    return frozenset(match.group(1).split()) if match is not None else None
+
+
+def read_cpu_flags() -> Optional[FrozenSet[str]]:
+    """Return the host CPU's feature flags, or None when they are unknown.
+
+    Only Linux exposes them here; other hosts, and an unreadable
+    /proc/cpuinfo, give None rather than an empty set.
+    """
+    if platform.system() != 'Linux':
+        return None
+    try:
+        with open(CPUINFO_PATH, 'r') as f:
+            return parse_cpu_flags(f.read())
+    except OSError:
+        return None
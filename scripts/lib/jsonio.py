@@ -0,0 +1,33 @@
+"""JSON file helpers that use orjson when it is installed."""
+import json
+import os
+from typing import Any
+
+try:
+    import orjson  # optional, faster JSON parsing and serialization
+except ImportError:
+    orjson = None
+
+
+def load_json(path: "os.PathLike[str]") -> Any:
+    """Parse a JSON file.
+
+    Malformed input raises json.JSONDecodeError with either backend.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dump_json(path: "os.PathLike[str]", data: Any, sort_keys: bool = False) -> None:
+    """Serialize data as JSON indented by two spaces and write it in one call."""
+    if orjson is not None:
+        # Non-string keys are stringified, as the json module does
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        payload = orjson.dumps(data, option=option)
+    else:
+        payload = json.dumps(data, indent=2, sort_keys=sort_keys).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
@@ -0,0 +1,117 @@
+"""Markdown link index shared by the link checking and fixing scripts.
+
+Scanning every markdown file for links is the bulk of each tool's work,
+so the matches are cached on disk per file and only files whose mtime or
+size changed are re-read on the tool's next run. The tools share the cache
+file, but each one's link pattern gets its own section.
+"""
+import bisect
+import importlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Iterable, List, Optional, Pattern
+
+from lib.jsonio import dump_json, load_json
+
+INDEX_FILE = '.link_index.json'
+INDEX_VERSION = 2
+
+# Below this many stale files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+
+def scan_links(pattern: Pattern[str], path: str, max_bytes: Optional[int] = None) -> List[list]:
+    """Return [lineno, *groups] for every match of pattern in the file at path."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if max_bytes is not None and os.fstat(f.fileno()).st_size > max_bytes:
+            return []
+        content = f.read()
+    # Offsets of every line start, so a match position maps to its line by bisection
+    line_starts = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return [[bisect.bisect_right(line_starts, m.start()), *m.groups()]
+            for m in pattern.finditer(content)]
+
+
+@lru_cache(maxsize=None)
+def _compile(engine: str, source: str, flags: int) -> Pattern[str]:
+    """Compile source with the named regex module, once per worker process."""
+    module = importlib.import_module(engine)
+    return module.compile(source, flags) if flags else module.compile(source)
+
+
+def _scan_source(engine: str, source: str, flags: int, path: str,
+                 max_bytes: Optional[int] = None) -> List[list]:
+    """scan_links for pool workers, which get the pattern source rather than
+    the compiled pattern since re2 patterns need not pickle."""
+    return scan_links(_compile(engine, source, flags), path, max_bytes)
+
+
+def build_index(root: str, paths: Iterable[str], pattern: Pattern[str],
+                max_bytes: Optional[int] = None,
+                index_dir: Optional[str] = None) -> Dict[str, List[list]]:
+    """Map each of paths (relative to root) to its pattern matches.
+
+    Results are cached in INDEX_FILE under index_dir (root by default),
+    separately per root and pattern, keyed by each file's mtime and size.
+    Files that disappear before they can be statted are left out of the
+    result.
+    """
+    index_path = os.path.join(root if index_dir is None else index_dir, INDEX_FILE)
+    try:
+        cache = load_json(index_path)
+    except (OSError, ValueError):
+        cache = {}
+    # Start over on any other version or shape rather than failing every tool
+    if (not isinstance(cache, dict) or cache.get('version') != INDEX_VERSION
+            or not isinstance(cache.get('patterns'), dict)):
+        cache = {'version': INDEX_VERSION, 'patterns': {}}
+    section_key = f"{os.path.abspath(root)}\0{pattern.pattern}\0{max_bytes}"
+    cached = cache['patterns'].get(section_key)
+    if not isinstance(cached, dict):
+        cached = {}
+
+    section = {}
+    stale = []
+    for path in paths:
+        try:
+            st = os.stat(os.path.join(root, path))
+        except FileNotFoundError:
+            continue
+        entry = cached.get(path)
+        if (isinstance(entry, list) and len(entry) == 3
+                and entry[0] == st.st_mtime_ns and entry[1] == st.st_size):
+            section[path] = entry
+        else:
+            section[path] = [st.st_mtime_ns, st.st_size, None]
+            stale.append(path)
+
+    if stale:
+        full_paths = [os.path.join(root, path) for path in stale]
+        if len(stale) >= PARALLEL_THRESHOLD:
+            # Only stdlib patterns carry flags; re2 is recompiled from source alone
+            is_re = isinstance(pattern, re.Pattern)
+            engine = 're' if is_re else type(pattern).__module__.partition('.')[0]
+            scan = partial(_scan_source, engine, pattern.pattern,
+                           pattern.flags if is_re else 0, max_bytes=max_bytes)
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                results = list(executor.map(scan, full_paths, chunksize=16))
+        else:
+            results = list(map(partial(scan_links, pattern, max_bytes=max_bytes), full_paths))
+        for path, links in zip(stale, results):
+            section[path][2] = links
+
+    # Rewrite the cache only when something was rescanned or removed
+    if stale or len(section) != len(cached):
+        cache['patterns'][section_key] = section
+        try:
+            dump_json(index_path, cache)
+        except OSError:
+            pass
+
+    return {path: entry[2] for path, entry in section.items()}
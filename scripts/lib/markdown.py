@@ -0,0 +1,33 @@
+"""Shared markdown tree traversal for the documentation scripts."""
+import os
+from typing import AbstractSet, Iterator, Tuple
+
+DEFAULT_SKIP_DIRS = frozenset({'.git'})
+
+
+def walk_markdown(root: str, skip_dirs: AbstractSet[str] = DEFAULT_SKIP_DIRS) -> Iterator[str]:
+    """Yield paths of all .md files under root.
+
+    Uses os.scandir so file/directory classification comes from the
+    directory entry itself instead of an extra stat per entry.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        # Unreadable or vanished directories are skipped, as os.walk does
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs:
+                    yield from walk_markdown(entry.path, skip_dirs)
+            elif entry.name.endswith('.md'):
+                yield entry.path
+
+
+def iter_markdown(root: str, skip_dirs: AbstractSet[str] = DEFAULT_SKIP_DIRS,
+                  encoding: str = 'utf-8') -> Iterator[Tuple[str, str]]:
+    """Yield (path, content) for every .md file under root, reading each once."""
+    for path in walk_markdown(root, skip_dirs):
+        with open(path, 'r', encoding=encoding) as f:
+            yield path, f.read()
@@ -17,8 +17,18 @@ import re
 import sys
 import json
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+from lib.jsonio import dump_json, load_json
+from lib.link_index import build_index
+
+try:
+    import re2  # optional, linear-time matching without backtracking
+except ImportError:
+    re2 = None
 
 # Configuration
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -26,9 +36,16 @@ DOCS_DIR = os.path.join(ROOT_DIR, "docs")
 REPORT_PATH = os.path.join(ROOT_DIR, "link_campaign_report.md")
 LINK_MAPPING_FILE = os.path.join(ROOT_DIR, "scripts", "link_mappings.json")
 
+# A miss in the exact-case path sets only proves absence where names are
+# case-sensitive (not on Windows, nor macOS by default)
+CASE_SENSITIVE_FS = (os.path.normcase('A') != 'a'
+                     and not os.path.exists(ROOT_DIR.swapcase()))
+
 # Regex patterns
-MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-ANCHOR_PATTERN = re.compile(r'(.*)#(.*)')
+MARKDOWN_LINK_PATTERN = (re2 if re2 is not None else re).compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
+# Larger files are not hand-written docs, so they are not scanned for links
+MAX_SOURCE_BYTES = 4 * 1024 * 1024
 
 # Console colors
 RED = '\033[91m'
@@ -37,13 +54,49 @@ YELLOW = '\033[93m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
+def read_source(source_file: str) -> Optional[str]:
+    """Read a markdown file relative to ROOT_DIR, or None if it has vanished"""
+    try:
+        with open(os.path.join(ROOT_DIR, source_file), 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def split_rel(rel_path: str) -> List[str]:
+    """Split a normalized path relative to ROOT_DIR into its components"""
+    return rel_path.split(os.sep) if rel_path else []
+
+
+def rel_parts(target: List[str], source_dir: List[str]) -> List[str]:
+    """Components of the path from source_dir to target.
+
+    Both are split_rel() components of normalized paths under ROOT_DIR, so
+    the common prefix is all os.path.relpath would work out, without its
+    abspath calls.
+    """
+    common = 0
+    for target_part, source_part in zip(target, source_dir):
+        if target_part != source_part:
+            break
+        common += 1
+    return ['..'] * (len(source_dir) - common) + target[common:]
+
+
 # Link database - structure to hold all documents and links
 
 
 class LinkDatabase:
     def __init__(self):
         self.all_files: set[str] = set()  # All available markdown files
-        self.file_content: Dict[str, str] = {}  # Cache of file content
+        # Lowercased basename -> markdown files with that name
+        self.by_basename: Dict[str, List[str]] = defaultdict(list)
+        # Absolute paths of every entry seen while scanning, and the
+        # directories whose contents were fully listed
+        self.existing_paths: set[str] = set()
+        self.scanned_dirs: set[str] = set()
+        # (broken link, source directory) -> suggested fix
+        self.suggestion_cache: Dict[Tuple[str, str], Optional[str]] = {}
         # List of broken links found
         self.broken_links: List[Dict[str, Optional[str]]] = []
         # List of links that were fixed
@@ -56,8 +109,7 @@ class LinkDatabase:
         """Load any custom link mappings from the mapping file"""
         if os.path.exists(LINK_MAPPING_FILE):
             try:
-                with open(LINK_MAPPING_FILE, 'r') as f:
-                    self.custom_mappings = json.load(f)
+                self.custom_mappings = load_json(LINK_MAPPING_FILE)
                 print(
                     f"{BLUE}Loaded {len(self.custom_mappings)} custom link mappings{RESET}")
             except json.JSONDecodeError:
@@ -66,89 +118,103 @@ class LinkDatabase:
 
     def save_custom_mappings(self) -> None:
         """Save custom mappings back to the file"""
-        with open(LINK_MAPPING_FILE, 'w') as f:
-            json.dump(self.custom_mappings, f, indent=2, sort_keys=True)
+        dump_json(LINK_MAPPING_FILE, self.custom_mappings, sort_keys=True)
 
     def scan_all_files(self) -> None:
         """Build a database of all markdown files in the repository"""
         print(f"{BLUE}Building file database...{RESET}")
-        for root, dirs, files in os.walk(ROOT_DIR):
-            # Skip .git and other hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-            for file in files:
-                if file.lower().endswith('.md'):
-                    full_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(full_path, ROOT_DIR)
+        # scandir entries carry their file type, so no per-entry stat is needed
+        stack = [ROOT_DIR]
+        while stack:
+            subdirs = []
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                # Unreadable or vanished directories are skipped, as os.walk
+                # does; they stay out of scanned_dirs so path_exists stats them
+                continue
+            self.scanned_dirs.add(current)
+            for entry in entries:
+                # Symlinks only count as existing if their target does
+                if not entry.is_symlink() or os.path.exists(entry.path):
+                    self.existing_paths.add(entry.path)
+                # Skip .git and other hidden directories
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.'):
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith('.md'):
+                    rel_path = os.path.relpath(entry.path, ROOT_DIR)
                     self.all_files.add(rel_path)
+            # Visit directories in the same top-down order as os.walk
+            stack.extend(reversed(subdirs))
+
+        # Index by basename so link matching is a lookup, not a scan
+        for rel_path in self.all_files:
+            self.by_basename[os.path.basename(rel_path).lower()].append(rel_path)
 
         print(f"{GREEN}Found {len(self.all_files)} markdown files{RESET}")
 
+    def path_exists(self, path: str) -> bool:
+        """Check a normalized absolute path against the scanned tree"""
+        if path in self.existing_paths:
+            return True
+        if CASE_SENSITIVE_FS and os.path.dirname(path) in self.scanned_dirs:
+            return False
+        # Outside the scanned tree (hidden directories, parent of ROOT_DIR),
+        # or a differently cased name on a case-insensitive filesystem
+        return os.path.exists(path)
+
     def find_best_match(self, broken_link: str, source_file: str) -> Optional[str]:
         """Find the best match for a broken link based on filename"""
-        if broken_link in self.custom_mappings:
-            return self.custom_mappings[broken_link]
-
+        mapped = self.custom_mappings.get(broken_link)
+        if mapped is not None:
+            return mapped
+        # A mapping for the bare path also covers links to its anchors
+        path, hash_sign, anchor = broken_link.partition('#')
+        if hash_sign:
+            mapped = self.custom_mappings.get(path)
+            if mapped is not None:
+                return mapped if '#' in mapped else f"{mapped}#{anchor}"
+
+        # The suggestion only depends on the link and where it is used from,
+        # so links repeated across a directory are matched once
+        source_dir = os.path.dirname(source_file)
+        key = (broken_link, source_dir)
+        if key not in self.suggestion_cache:
+            self.suggestion_cache[key] = self._match_link(broken_link, source_dir)
+        return self.suggestion_cache[key]
+
+    def _match_link(self, broken_link: str, source_dir: str) -> Optional[str]:
+        """Find the closest file named like the link's target"""
         # Extract the filename from the broken link
         link_parts = broken_link.split('/')
         target_file = link_parts[-1]
         anchor = None
 
-        # Handle anchors
-        anchor_match = ANCHOR_PATTERN.match(target_file)
-        if anchor_match:
-            target_file = anchor_match.group(1)
-            anchor = anchor_match.group(2)
+        # Handle anchors (split on the last '#')
+        if '#' in target_file:
+            target_file, _, anchor = target_file.rpartition('#')
+
+        # Look for exact filename matches, preferring files below the root
+        candidates = self.by_basename.get(target_file.lower())
+        if not candidates:
+            # The target was deleted outright; nothing to rank
+            return None
+        candidates = [f for f in candidates if os.sep in f] or candidates
 
-        # Look for exact filename matches
         matches = []
-        for file in self.all_files:
-            if file.lower().endswith('/' + target_file.lower()):
-                # Calculate distance from source to potential target
-                source_dir = os.path.dirname(source_file)
-                target_dir = os.path.dirname(file)
-                # Handle empty paths for relpath
-                if not source_dir:
-                    source_dir = "."
-                if not target_dir:
-                    target_dir = "."
-                try:
-                    rel_path = os.path.relpath(target_dir, source_dir)
-                    distance = len(rel_path.split('/'))
-                except ValueError:
-                    # If paths are on different drives, set a high distance
-                    distance = 1000
-                matches.append((file, distance))
-
-        # If no match found by filename, try case-insensitive match
-        if not matches:
-            for file in self.all_files:
-                if os.path.basename(file).lower() == target_file.lower():
-                    source_dir = os.path.dirname(source_file)
-                    target_dir = os.path.dirname(file)
-                    # Handle empty paths for relpath
-                    if not source_dir:
-                        source_dir = "."
-                    if not target_dir:
-                        target_dir = "."
-                    try:
-                        rel_path = os.path.relpath(target_dir, source_dir)
-                        distance = len(rel_path.split('/'))
-                    except ValueError:
-                        # If paths are on different drives, set a high distance
-                        distance = 1000
-                    matches.append((file, distance))
-
-        # Sort matches by distance (ascending)
-        matches.sort(key=lambda x: x[1])
-
-        # Return the best match if found
+        source_parts = split_rel(source_dir)
+        for file in candidates:
+            # Calculate distance from source to potential target directory
+            distance = len(rel_parts(split_rel(os.path.dirname(file)), source_parts)) or 1
+            matches.append((file, distance))
+
+        # Return the closest match if found (first one wins ties)
         if matches:
-            best_match = matches[0][0]
-            rel_path = os.path.relpath(os.path.join(ROOT_DIR, best_match),
-                                       os.path.dirname(os.path.join(ROOT_DIR, source_file)))
-            # Normalize path with forward slashes
-            rel_path = rel_path.replace('\\', '/')
+            best_match = min(matches, key=lambda x: x[1])[0]
+            rel_path = '/'.join(rel_parts(split_rel(best_match), source_parts))
             # Add anchor if present
             if anchor:
                 rel_path = f"{rel_path}#{anchor}"
@@ -159,36 +225,30 @@ class LinkDatabase:
     def check_links(self, dry_run: bool = True) -> None:
         """Check all links in all markdown files"""
         print(f"{BLUE}Checking links in all files...{RESET}")
-        for source_file in self.all_files:
-            full_path = os.path.join(ROOT_DIR, source_file)
-            if not os.path.exists(full_path):
-                continue
-
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                self.file_content[source_file] = content
-
-            # Find all markdown links
-            links = MARKDOWN_LINK_PATTERN.findall(content)
-            for text, link in links:
+        # Link matches come from the shared index, so unchanged files are not re-read
+        index = build_index(ROOT_DIR, self.all_files, MARKDOWN_LINK_PATTERN,
+                            max_bytes=MAX_SOURCE_BYTES)
+        for source_file, links in index.items():
+            source_dir_abs = os.path.dirname(
+                os.path.join(ROOT_DIR, source_file))
+
+            for _, text, link in links:
                 # Skip external links and absolute links to pages
                 if link.startswith(('http://', 'https://', '#', '/')):
                     continue
 
                 # Normalize the path
                 # Remove anchors for path checking
-                link_path = link.split('#')[0]
+                link_path = link.partition('#')[0]
                 if not link_path:  # Skip anchor-only links
                     continue
 
                 # Resolve the link path relative to the source file
                 link_full_path = os.path.normpath(
-                    os.path.join(os.path.dirname(
-                        os.path.join(ROOT_DIR, source_file)), link_path)
-                )
+                    os.path.join(source_dir_abs, link_path))
                 # Relative path might be used for reporting or later features
                 # Check if the target exists
-                if not os.path.exists(link_full_path):
+                if not self.path_exists(link_full_path):
                     # This link is broken
                     best_match = self.find_best_match(link, source_file)
                     self.broken_links.append({
@@ -208,39 +268,31 @@ class LinkDatabase:
         """Fix broken links where a confident match exists"""
         print(f"{BLUE}Fixing broken links...{RESET}")
 
-        # Group broken links by source file for efficient processing
-        links_by_file = defaultdict(list)
-        for link_info in self.broken_links:
-            links_by_file[link_info['source']].append(link_info)
-
-        # Process each file
-        for source_file, links in links_by_file.items():
-            content = self.file_content[source_file]
-            updated_content = content
+        # check_links records each file's broken links contiguously, so a
+        # single groupby pass yields them per source file
+        for source_file, links in groupby(self.broken_links, key=itemgetter('source')):
+            content = read_source(source_file)
+            if content is None:
+                continue
+            # Old link literal -> replacement, applied together below
+            replacements: Dict[str, str] = {}
             file_changes = []
 
             # Sort links by length (descending) to avoid replacement conflicts
-            # Use sorted with a type-safe approach
-            links = sorted(links, key=lambda x: len(
-                str(x.get('link', ''))), reverse=True)
+            links = sorted(links, key=lambda x: len(x['link']), reverse=True)
 
             for link_info in links:
                 suggested_fix = link_info['suggested_fix']
                 if suggested_fix is not None:
-                    old_link_pattern = re.escape(
-                        f'[{link_info["text"]}]({link_info["link"]})')
+                    old_link = f'[{link_info["text"]}]({link_info["link"]})'
                     new_link = f'[{link_info["text"]}]({suggested_fix})'
 
-                    # Check if this exact pattern exists in the content
-                    if re.search(old_link_pattern, updated_content):
-                        updated_content = re.sub(
-                            old_link_pattern,
-                            # Escape backslashes in replacement
-                            new_link.replace('\\', '\\\\'),
-                            updated_content
-                        )
+                    # Check if this exact link exists in the content and has
+                    # not already been claimed by a duplicate entry
+                    if old_link not in replacements and old_link in content:
+                        replacements[old_link] = new_link
                         file_changes.append({
-                            'old': f'[{link_info["text"]}]({link_info["link"]})',
+                            'old': old_link,
                             'new': new_link
                         })
                         self.fixed_links.append(link_info)
@@ -251,6 +303,18 @@ class LinkDatabase:
                     # No suggested fix
                     self.manual_review.append(link_info)
 
+            # Apply every replacement in one scan, longest literal first
+            if len(replacements) > 1:
+                pattern = re.compile('|'.join(
+                    map(re.escape, sorted(replacements, key=len, reverse=True))))
+                updated_content = pattern.sub(
+                    lambda m: replacements[m.group(0)], content)
+            elif replacements:
+                (old_link, new_link), = replacements.items()
+                updated_content = content.replace(old_link, new_link)
+            else:
+                updated_content = content
+
             # Write back the updated content if changes were made
             if content != updated_content:
                 full_path = os.path.join(ROOT_DIR, source_file)
@@ -271,72 +335,61 @@ class LinkDatabase:
         """Generate a detailed report of link issues and fixes"""
         print(f"{BLUE}Generating report...{RESET}")
 
-        with open(REPORT_PATH, 'w', encoding='utf-8') as report:
-            report.write("# Link Campaign Report\n\n")
-            report.write(f"Generated: June 17, 2025\n\n")
-
+        # Assemble the whole report, then write it in one call
+        parts = [
+            "# Link Campaign Report\n\n",
+            "Generated: June 17, 2025\n\n",
             # Summary
-            report.write("## Summary\n\n")
-            report.write(f"- Total markdown files: {len(self.all_files)}\n")
-            report.write(f"- Broken links found: {len(self.broken_links)}\n")
-            report.write(
-                f"- Links fixed automatically: {len(self.fixed_links)}\n")
-            report.write(
-                f"- Links requiring manual review: {len(self.manual_review)}\n\n")
-
-            # Links fixed
-            if self.fixed_links:
-                report.write("## Links Fixed Automatically\n\n")
-                report.write(
-                    "| Source File | Link Text | Old Path | New Path |\n")
-                report.write(
-                    "|-------------|-----------|----------|----------|\n")
-
-                for link in self.fixed_links:
-                    report.write(
-                        f"| {link['source']} | {link['text']} | {link['link']} | {link['suggested_fix']} |\n")
-
-                report.write("\n")
-
-            # Links needing manual review
-            if self.manual_review:
-                report.write("## Links Requiring Manual Review\n\n")
-                report.write(
-                    "| Source File | Link Text | Broken Path | Suggested Fix |\n")
-                report.write(
-                    "|-------------|-----------|-------------|---------------|\n")
-
-                for link in self.manual_review:
-                    fix = link['suggested_fix'] if link['suggested_fix'] else "No suggestion"
-                    report.write(
-                        f"| {link['source']} | {link['text']} | {link['link']} | {fix} |\n")
-
-                report.write("\n")
-
-            # Guidance
-            report.write("## Next Steps\n\n")
-            report.write(
-                "1. Review this report for any incorrectly fixed links\n")
-            report.write(
-                "2. Manually update links in the 'Manual Review' section\n")
-            report.write(
-                "3. Run the link checker again to verify all issues are resolved\n")
-            report.write("4. Update custom mappings for problematic links\n\n")
-
-            report.write("## How to Create Custom Link Mappings\n\n")
-            report.write(
-                "Edit the file `scripts/link_mappings.json` with entries like:\n\n")
-            report.write("```json\n")
-            report.write(
-                "{\n  \"broken/path.md\": \"correct/path.md\",\n  \"another/broken.md\": \"../fixed.md\"\n}\n")
-            report.write("```\n")
+            "## Summary\n\n",
+            f"- Total markdown files: {len(self.all_files)}\n",
+            f"- Broken links found: {len(self.broken_links)}\n",
+            f"- Links fixed automatically: {len(self.fixed_links)}\n",
+            f"- Links requiring manual review: {len(self.manual_review)}\n\n",
+        ]
+
+        # Links fixed
+        if self.fixed_links:
+            parts.append("## Links Fixed Automatically\n\n")
+            parts.append("| Source File | Link Text | Old Path | New Path |\n")
+            parts.append("|-------------|-----------|----------|----------|\n")
+            parts.extend(
+                f"| {link['source']} | {link['text']} | {link['link']} | {link['suggested_fix']} |\n"
+                for link in self.fixed_links)
+            parts.append("\n")
+
+        # Links needing manual review
+        if self.manual_review:
+            parts.append("## Links Requiring Manual Review\n\n")
+            parts.append("| Source File | Link Text | Broken Path | Suggested Fix |\n")
+            parts.append("|-------------|-----------|-------------|---------------|\n")
+            parts.extend(
+                f"| {link['source']} | {link['text']} | {link['link']} | "
+                f"{link['suggested_fix'] if link['suggested_fix'] else 'No suggestion'} |\n"
+                for link in self.manual_review)
+            parts.append("\n")
+
+        # Guidance
+        parts.append(
+            "## Next Steps\n\n"
+            "1. Review this report for any incorrectly fixed links\n"
+            "2. Manually update links in the 'Manual Review' section\n"
+            "3. Run the link checker again to verify all issues are resolved\n"
+            "4. Update custom mappings for problematic links\n\n"
+            "## How to Create Custom Link Mappings\n\n"
+            "Edit the file `scripts/link_mappings.json` with entries like:\n\n"
+            "```json\n"
+            "{\n  \"broken/path.md\": \"correct/path.md\",\n  \"another/broken.md\": \"../fixed.md\"\n}\n"
+            "```\n"
+        )
+
+        with open(REPORT_PATH, 'w', encoding='utf-8') as report:
+            report.write(''.join(parts))
 
         print(f"{GREEN}Report generated at {REPORT_PATH}{RESET}")
 
         # Create or update the link mappings file
         if not os.path.exists(LINK_MAPPING_FILE):
-            with open(LINK_MAPPING_FILE, 'w', encoding='utf-8') as f:
-                json.dump({}, f, indent=2)
+            dump_json(LINK_MAPPING_FILE, {})
             print(
                 f"{GREEN}Created empty link mappings file at {LINK_MAPPING_FILE}{RESET}")
 
@@ -1,36 +1,53 @@
 #!/usr/bin/env python3
+"""Report broken relative links in the markdown files under the current directory.
+
+Link matches are cached in .link_index.json (lib.link_index.INDEX_FILE) at
+the repository root, so the checker writes that file wherever it is run from.
+"""
 
 import os
 import re
+from functools import lru_cache
+
+from lib.link_index import build_index
+from lib.markdown import walk_markdown
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
-broken = []
 # Regex to capture markdown links with relative paths (skip http/https)
-link_regex = re.compile(r'\[.*?\]\((?!http)([^)]+)\)')
-
-for root, dirs, files in os.walk('.'):
-    # skip version control directories
-    if '.git' in dirs:
-        dirs.remove('.git')
-    for fname in files:
-        if fname.endswith('.md'):
-            fpath = os.path.join(root, fname)
-            with open(fpath, 'r', encoding='utf-8') as f:
-                for lineno, line in enumerate(f, start=1):
-                    for match in link_regex.finditer(line):
-                        link = match.group(1).split('#')[0]
-                        # ignore empty links
-                        if not link:
-                            continue
-                        # resolve path
-                        target = os.path.normpath(os.path.join(root, link))
-                        if not os.path.exists(target):
-                            broken.append((fpath, lineno, link))
-# Output report
-if broken:
-    print("Broken links detected:")
-    for fpath, lineno, link in broken:
-        print(f"{fpath}:{lineno} -> {link}")
-    exit(1)
-else:
+link_regex = re.compile(r'\[.*?\]\((?!http)([^)\n]+)\)')
+
+
+@lru_cache(maxsize=None)
+def target_exists(target):
+    # Popular targets (README.md etc.) are only statted once
+    return os.path.exists(target)
+
+
+def main():
+    broken = []
+    # Link matches come from the shared index, so unchanged files are not re-read
+    index = build_index('.', walk_markdown('.'), link_regex, index_dir=REPO_ROOT)
+    for fpath, links in index.items():
+        root = os.path.dirname(fpath)
+        for lineno, link in links:
+            link = link.split('#')[0]
+            # ignore empty links
+            if not link:
+                continue
+            # resolve path
+            target = os.path.normpath(os.path.join(root, link))
+            if not target_exists(target):
+                broken.append((fpath, lineno, link))
+    # Output report
+    if broken:
+        print("Broken links detected:")
+        for fpath, lineno, link in broken:
+            print(f"{fpath}:{lineno} -> {link}")
+        return 1
     print("No broken links found.")
-    exit(0)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
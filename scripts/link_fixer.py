@@ -3,51 +3,87 @@
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+from lib.link_index import build_index
+from lib.markdown import walk_markdown
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 # Regex to capture markdown links with relative paths (skip http/https)
-link_regex = re.compile(r"(\[.*?\]\()(?P<link>(?!http)([^)]+))(\))")
+link_regex = re.compile(r"(\[.*?\]\()(?P<link>(?!http)([^)\n]+))(\))")
 
 def find_target(root_dir, filename):
-    for dirpath, dirs, files in os.walk(root_dir):
-        if filename in files:
-            return os.path.join(dirpath, filename)
+    # Same top-down search order as os.walk, but file types come from the
+    # scandir entries rather than a stat per entry
+    subdirs = []
+    try:
+        with os.scandir(root_dir) as it:
+            entries = list(it)
+    except OSError:
+        # Unreadable or vanished directories are skipped, as os.walk does
+        return None
+    for entry in entries:
+        if entry.is_dir():
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+        elif entry.name == filename:
+            return entry.path
+    for subdir in subdirs:
+        found = find_target(subdir, filename)
+        if found:
+            return found
     return None
 
 
+def is_broken(root, link):
+    """True if link, as written in a file under root, needs fixing."""
+    # skip empty or absolute paths
+    if not link or link.startswith('/'):
+        return False
+    return not os.path.exists(os.path.normpath(os.path.join(root, link)))
+
+
+def fix_file(fpath, base_dir):
+    root, fname = os.path.split(fpath)
+    with open(fpath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    def repl(m):
+        link = m.group('link').partition('#')[0]
+        if not is_broken(root, link):
+            return m.group(0)
+        filename = os.path.basename(link)
+        new_abs = find_target(base_dir, filename)
+        if new_abs:
+            rel = os.path.relpath(new_abs, start=root)
+            sys.stdout.write(f"[FIX] {fpath}:{fname} {link} -> {rel}\n")
+            return m.group(1) + rel + m.group(4)
+        return m.group(0)
+    # One substitution pass over the whole file rather than one per line
+    new_content = link_regex.sub(repl, content)
+    if new_content != content:
+        with open(fpath, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+
+
 def fix_links(base_dir):
-    broken = []
-    for root, dirs, files in os.walk(base_dir):
-        # skip .git
-        dirs[:] = [d for d in dirs if d != '.git']
-        for fname in files:
-            if not fname.endswith('.md'):
-                continue
-            fpath = os.path.join(root, fname)
-            updated = False
-            lines = []
-            with open(fpath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    def repl(m):
-                        link = m.group('link').split('#')[0]
-                        # skip empty or absolute paths
-                        if not link or link.startswith('/'):
-                            return m.group(0)
-                        target = os.path.normpath(os.path.join(root, link))
-                        if os.path.exists(target):
-                            return m.group(0)
-                        filename = os.path.basename(link)
-                        new_abs = find_target(base_dir, filename)
-                        if new_abs:
-                            rel = os.path.relpath(new_abs, start=root)
-                            sys.stdout.write(f"[FIX] {fpath}:{fname} {link} -> {rel}\n")
-                            updated = True
-                            return m.group(1) + rel + m.group(4)
-                        return m.group(0)
-                    newline = link_regex.sub(repl, line)
-                    lines.append(newline)
-            if updated:
-                with open(fpath, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
+    # The shared link index says which files have broken links without
+    # re-reading unchanged ones; only those files are rewritten
+    index = build_index(base_dir,
+                        (os.path.relpath(p, base_dir) for p in walk_markdown(base_dir)),
+                        link_regex, index_dir=REPO_ROOT)
+    to_fix = []
+    for rel_path, links in index.items():
+        fpath = os.path.join(base_dir, rel_path)
+        root = os.path.dirname(fpath)
+        if any(is_broken(root, link.partition('#')[0]) for _, _, link, _, _ in links):
+            to_fix.append(fpath)
+    # Each file is read and rewritten independently, so overlap the IO
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        # Drain the results so a failure in any worker is raised here
+        for _ in executor.map(fix_file, to_fix, repeat(base_dir)):
+            pass
     print("Link fixing completed.")
 
 if __name__ == '__main__':
@@ -23,6 +23,9 @@ YELLOW = "\033[93m"
 RED = "\033[91m"
 RESET = "\033[0m"
 
+# Markdown link pattern, compiled once for all files
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
 # Load custom link mappings
 custom_mappings: Dict[str, str] = {}
 try:
@@ -129,18 +132,13 @@ def check_links_in_file(file_path: str) -> Tuple[List[Dict[str, Any]], List[Dict
         return broken_links, valid_links
 
     # Find all markdown links
-    link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-    links = link_pattern.findall(content)
+    links = LINK_PATTERN.findall(content)
 
     for link_text, link_path in links:
-        # Skip external links
+        # Skip external links and anchors within the same file
         if link_path.startswith(('http://', 'https://', 'mailto:', '#')):
             continue
 
-        # Skip anchors within the same file
-        if link_path.startswith('#'):
-            continue
-
         # Resolve relative path
         source_dir = os.path.dirname(file_path)
         full_path = os.path.normpath(os.path.join(source_dir, link_path))